@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import os
 
@@ -8,10 +8,29 @@ import os
 if not os.path.exists("data"):
     os.makedirs("data")
 
-URL_DATABASE = "sqlite:///./data/scores.db"
+URL_DATABASE = "sqlite+aiosqlite:///./data/scores.db"
 
-engine = create_engine(URL_DATABASE, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool de conexiones persistentes: evita abrir SQLite en cada request y mantiene su caché caliente
+engine = create_async_engine(
+    URL_DATABASE,
+    connect_args={"check_same_thread": False},
+    pool_size=10,
+    pool_pre_ping=True,
+)
+
+# WAL permite lectores concurrentes con un escritor y agrupa los fsync;
+# synchronous=NORMAL basta para un marcador (solo se arriesga el último commit ante un corte de luz)
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=67108864")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.close()
+
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 class Score(Base):
@@ -22,5 +41,12 @@ class Score(Base):
     score = Column(Integer)
     date = Column(DateTime, default=datetime.utcnow)
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
+    # El Top 5 (ORDER BY score DESC LIMIT 5) se resuelve recorriendo el índice, sin ordenar la tabla
+    __table_args__ = (Index("ix_scores_score_desc", score.desc()),)
+
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all no agrega índices nuevos a una tabla que ya existía
+        for index in Score.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
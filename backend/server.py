@@ -1,22 +1,26 @@
-from fastapi import FastAPI, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+import time
+from fastapi import FastAPI, Depends, HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import database
 from database import Score, SessionLocal
 import os
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Inicializar DB
+    await database.init_db()
+    yield
+    await database.engine.dispose()
 
-# Inicializar DB
-database.init_db()
+app = FastAPI(lifespan=lifespan)
 
 # Dependencia para obtener sesión de DB
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Modelos Pydantic
 class ScoreCreate(BaseModel):
@@ -30,19 +34,45 @@ class ScoreResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Serializa la lista completa de una sola vez a bytes JSON
+SCORES_ADAPTER = TypeAdapter(list[ScoreResponse])
+
+# Caché en proceso del Top 5 (ya en JSON): las lecturas superan por mucho a las escrituras
+TOP_CACHE_TTL = 2.0
+_top_cache: tuple[float, bytes] | None = None
+# Se incrementa en cada escritura; un GET solo guarda su resultado si no cambió durante la consulta
+_top_generation = 0
+
 # --- API Endpoints ---
 
-@app.get("/api/scores", response_model=list[ScoreResponse])
-def get_top_scores(db: Session = Depends(get_db)):
+# response_class=Response evita que FastAPI vuelva a validar/serializar; el esquema se documenta aparte
+@app.get("/api/scores", response_class=Response,
+         responses={200: {"model": list[ScoreResponse]}})
+async def get_top_scores(db: AsyncSession = Depends(get_db)):
+    global _top_cache
+    cached = _top_cache
+    if cached is not None and time.monotonic() - cached[0] < TOP_CACHE_TTL:
+        return Response(content=cached[1], media_type="application/json")
+    generation = _top_generation
     # Retorna los top 5 puntajes
-    return db.query(Score).order_by(Score.score.desc()).limit(5).all()
+    rows = (await db.scalars(select(Score).order_by(Score.score.desc()).limit(5))).all()
+    top = SCORES_ADAPTER.validate_python(rows, from_attributes=True)
+    body = SCORES_ADAPTER.dump_json(top)
+    # un POST durante la consulta pudo dejar este Top 5 desactualizado: no se guarda
+    if generation == _top_generation:
+        _top_cache = (time.monotonic(), body)
+    return Response(content=body, media_type="application/json")
 
 @app.post("/api/scores")
-def create_score(score: ScoreCreate, db: Session = Depends(get_db)):
+async def create_score(score: ScoreCreate, db: AsyncSession = Depends(get_db)):
     db_score = Score(username=score.username, score=score.score)
     db.add(db_score)
-    db.commit()
-    db.refresh(db_score)
+    await db.commit()
+    # Invalida el Top 5 en caché (y cualquier GET que estuviera consultando)
+    global _top_cache, _top_generation
+    _top_generation += 1
+    _top_cache = None
+    await db.refresh(db_score)
     return db_score
 
 # --- Servir Frontend y Juego ---
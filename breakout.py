@@ -2,7 +2,8 @@
 Break Bricks (Breakout) in Python using Pygame
 ------------------------------------------------
 How to run:
-  1) pip install pygame
+  1) pip install pygame numpy
+     (optional) pip install numba  -> JIT-compiled brick collisions
   2) python breakout.py
 
 Controls:
@@ -24,20 +25,38 @@ Features:
 Tested with Pygame 2.5+
 """
 from __future__ import annotations
+import functools
 import math
 import random
 import sys
+import time
 import asyncio
 import json
-from dataclasses import dataclass
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
+import numpy as np
 import pygame as pg
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    # numba is optional: without it the kernels below run as plain Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
 # ----------------------------
 # Configuration
 # ----------------------------
 LOGICAL_W, LOGICAL_H = 800, 600
 FPS = 120
+FPS_REFRESH_MS = 100  # the FPS readout is re-rendered at most 10 times per second
+# Only used when SDL's SCALED mode is unavailable: bilinear (smooth) vs nearest scaling
+SMOOTH_SCALING = False
 
 PADDLE_W = 110
 PADDLE_H = 16
@@ -57,9 +76,21 @@ BRICK_W = 56
 BRICK_H = 24
 BRICK_GAP = 4
 TOP_MARGIN = 80
+# Every level lays its bricks on one lattice; a cell is a brick plus its gap
+CELL_W = BRICK_W + BRICK_GAP
+CELL_H = BRICK_H + BRICK_GAP
+GRID_LEFT = (LOGICAL_W - (BRICK_COLS * BRICK_W + (BRICK_COLS - 1) * BRICK_GAP)) // 2
 
 LIVES_START = 3
 
+# Backend local (uvicorn server:app --port 8000) para la versión nativa
+SCORES_API_URL = "http://localhost:8000/api/scores"
+
+# Partial display updates only pay off while little of the screen changes
+DIRTY_MAX_RECTS = 40
+DIRTY_MAX_AREA = LOGICAL_W * LOGICAL_H // 4
+HUD_RECT = pg.Rect(0, 0, LOGICAL_W, TOP_MARGIN)
+
 # Colors
 WHITE = (240, 240, 240)
 BLACK = (10, 10, 20)
@@ -70,6 +101,7 @@ MAGENTA = (230, 120, 255)
 YELLOW = (255, 230, 120)
 ORANGE = (255, 170, 80)
 RED = (255, 95, 95)
+PALETTE = [MAGENTA, ORANGE, YELLOW, GREEN, CYAN, WHITE, RED]
 
 # Background Colors for Worlds
 BG_WORLD_1 = (10, 10, 20)
@@ -77,31 +109,109 @@ BG_WORLD_2 = (30, 5, 5)
 BG_WORLD_3 = (20, 5, 30)
 BG_MENU = (15, 15, 25)
 
+# pygame-ce batches blits in C without building a return list
+HAS_FBLITS = hasattr(pg.Surface, "fblits")
+
 # ----------------------------
 # Utility: render to logical surface then scale to window
 # ----------------------------
+def render_background(bg_color: tuple) -> pg.Surface:
+    """Fondo de un mundo con su grilla, para copiarlo entero cada frame"""
+    bg = pg.Surface((LOGICAL_W, LOGICAL_H))
+    bg.fill(bg_color)
+    line_col = (min(255, bg_color[0]+20), min(255, bg_color[1]+20), min(255, bg_color[2]+20))
+    for i in range(0, LOGICAL_W, 40):
+        pg.draw.line(bg, line_col, (i, 0), (i, LOGICAL_H))
+    for i in range(0, LOGICAL_H, 40):
+        pg.draw.line(bg, line_col, (0, i), (LOGICAL_W, i))
+    return bg.convert()
+
 class Screen:
     def __init__(self):
-        self.window = pg.display.set_mode((LOGICAL_W, LOGICAL_H), pg.RESIZABLE)
+        try:
+            # SDL scales the logical window to the real one on the GPU
+            self.window = pg.display.set_mode((LOGICAL_W, LOGICAL_H), pg.SCALED | pg.RESIZABLE)
+            self.sdl_scaled = True
+        except pg.error:
+            self.window = pg.display.set_mode((LOGICAL_W, LOGICAL_H), pg.RESIZABLE)
+            self.sdl_scaled = False
         pg.display.set_caption("Break Bricks - Python/Pygame (Nativo)")
-        self.surface = pg.Surface((LOGICAL_W, LOGICAL_H))
+        self.surface = self.window
+        self.scaled: pg.Surface | None = None
+        self.resized = False
+        self.fit_window()
+        # gameplay backgrounds (fill + grid) rendered once per world
+        self.backgrounds = {bg: render_background(bg) for bg in (BG_WORLD_1, BG_WORLD_2, BG_WORLD_3)}
+
+    def fit_window(self):
+        """Sin SCALED: dibuja directo en la ventana mientras mida 800x600, si no en una superficie lógica"""
+        if self.sdl_scaled:
+            return
+        if self.window.get_size() == (LOGICAL_W, LOGICAL_H):
+            self.surface = self.window
+        elif self.surface is self.window:
+            # same pixel format as the window, so the per-frame scale needs no conversion
+            self.surface = pg.Surface((LOGICAL_W, LOGICAL_H)).convert(self.window)
+        self.resized = True
 
     def begin(self, bg_color=BLACK):
-        self.surface.fill(bg_color)
-
-    def end(self):
+        bg = self.backgrounds.get(bg_color)
+        if bg is None:
+            self.surface.fill(bg_color)
+        else:
+            self.surface.blit(bg, (0, 0))
+
+    def end(self, dirty: list[pg.Rect] | None = None):
+        """Presenta el frame; `dirty` (coordenadas lógicas) limita lo que se actualiza"""
+        if dirty is not None and (len(dirty) >= DIRTY_MAX_RECTS
+                                  or sum(r.w * r.h for r in dirty) >= DIRTY_MAX_AREA):
+            dirty = None
+        if self.resized:
+            dirty = None
+            self.resized = False
+        if self.surface is self.window:
+            if dirty is None:
+                pg.display.flip()
+            else:
+                pg.display.update(dirty)
+            return
         win_w, win_h = self.window.get_size()
         scale = min(win_w / LOGICAL_W, win_h / LOGICAL_H)
         sw, sh = int(LOGICAL_W * scale), int(LOGICAL_H * scale)
         x = (win_w - sw) // 2
         y = (win_h - sh) // 2
-        scaled = pg.transform.smoothscale(self.surface, (sw, sh))
+        # reuse the scaled buffer until the window is resized
+        if self.scaled is None or self.scaled.get_size() != (sw, sh):
+            self.scaled = pg.Surface((sw, sh), 0, self.surface)
+            dirty = None
+        smooth = SMOOTH_SCALING and (sw % LOGICAL_W or sh % LOGICAL_H)
+        if smooth:
+            pg.transform.smoothscale(self.surface, (sw, sh), self.scaled)
+        else:
+            pg.transform.scale(self.surface, (sw, sh), self.scaled)
         self.window.fill((0, 0, 0))
-        self.window.blit(scaled, (x, y))
-        pg.display.flip()
+        self.window.blit(self.scaled, (x, y))
+        if dirty is None:
+            pg.display.flip()
+        else:
+            # floor/ceil so fractional scales never drop the last scaled column or row;
+            # smoothscale blends each pixel with its neighbours, so grow by one logical
+            # pixel first, and keep 1 window pixel for scale's rounding
+            fx, fy = sw / LOGICAL_W, sh / LOGICAL_H
+            pad = 1 if smooth else 0
+            rects = []
+            for r in dirty:
+                left = x + math.floor((r.left - pad) * fx) - 1
+                top = y + math.floor((r.top - pad) * fy) - 1
+                rects.append(pg.Rect(left, top, x + math.ceil((r.right + pad) * fx) + 1 - left,
+                                     y + math.ceil((r.bottom + pad) * fy) + 1 - top))
+            pg.display.update(rects)
     
     def get_mouse_pos(self):
         """Convierte posición del mouse de ventana a coordenadas lógicas"""
+        if self.surface is self.window:
+            # con SCALED (o ventana de 800x600) el mouse ya está en coordenadas lógicas
+            return pg.mouse.get_pos()
         win_w, win_h = self.window.get_size()
         scale = min(win_w / LOGICAL_W, win_h / LOGICAL_H)
         sw, sh = int(LOGICAL_W * scale), int(LOGICAL_H * scale)
@@ -122,59 +232,82 @@ class SFX:
             pg.mixer.init(frequency=44100, size=-16, channels=1)
         self.hit = self._tone(740, 0.04)
         self.brick = self._tone(1240, 0.05)
+        # brick hits get their own channel: a new hit restarts the tone instead
+        # of stacking copies or stealing the channels of the other effects
+        pg.mixer.set_reserved(1)
+        self.brick_channel = pg.mixer.Channel(0)
         self.lose = self._tone(140, 0.2)
         self.win = self._tone(520, 0.25)
 
     def _tone(self, freq, dur):
         rate = 44100
         n = int(rate * dur)
-        buf = bytearray()
-        for i in range(n):
-            # Simple decayed sine wave
-            t = i / rate
-            amp = int(32000 * (1 - i / n) * math.sin(2 * math.pi * freq * t))
-            buf += amp.to_bytes(2, byteorder="little", signed=True)
-        return pg.mixer.Sound(buffer=buf)
+        # Simple decayed sine wave, all samples at once
+        i = np.arange(n)
+        t = i / rate
+        env = 1 - i / n
+        buf = (32000 * env * np.sin(2 * np.pi * freq * t)).astype("<i2")
+        return pg.mixer.Sound(buffer=buf.tobytes())
 
 # ----------------------------
 # Entities
 # ----------------------------
-@dataclass
-class Paddle:
-    x: float = LOGICAL_W / 2
-    y: float = PADDLE_Y
-    w: float = PADDLE_W
-    h: float = PADDLE_H
-    vx: float = 0.0
+@njit(cache=True)
+def _update_paddle(x, vx, left, right, dt):
+    """Integra la paleta un paso (aceleración, fricción, tope de velocidad y paredes); devuelve (x, vx)"""
+    ax = 0.0
+    if left:
+        ax -= PADDLE_ACCEL
+    if right:
+        ax += PADDLE_ACCEL
+    vx += ax * dt
+    # friction
+    vx *= (1.0 - PADDLE_FRICTION * max(0.0, dt * FPS))
+    # clamp speed
+    vx = max(-PADDLE_MAX_SPEED, min(PADDLE_MAX_SPEED, vx))
+    x += vx * dt
+    # walls
+    half = PADDLE_W / 2
+    if x - half < 0:
+        x = half
+        vx = 0.0
+    if x + half > LOGICAL_W:
+        x = LOGICAL_W - half
+        vx = 0.0
+    return x, vx
 
+class Paddle:
+    def __init__(self, x: float = LOGICAL_W / 2, y: float = PADDLE_Y):
+        self.x = x
+        self.y = y
+        self.w = PADDLE_W
+        self.h = PADDLE_H
+        self.vx = 0.0
+        # one Rect for the paddle's lifetime, moved in place after each update
+        self._rect = pg.Rect(0, 0, self.w, self.h)
+        self._rect.topleft = (int(self.x - self.w / 2), int(self.y - self.h / 2))
+
+    @property
     def rect(self) -> pg.Rect:
-        return pg.Rect(int(self.x - self.w / 2), int(self.y - self.h / 2), int(self.w), int(self.h))
+        return self._rect
 
     def update(self, dt: float, left: bool, right: bool):
-        ax = 0.0
-        if left:
-            ax -= PADDLE_ACCEL
-        if right:
-            ax += PADDLE_ACCEL
-        self.vx += ax * dt
-        # friction
-        self.vx *= (1.0 - PADDLE_FRICTION * max(0.0, dt * FPS))
-        # clamp speed
-        self.vx = max(-PADDLE_MAX_SPEED, min(PADDLE_MAX_SPEED, self.vx))
-        self.x += self.vx * dt
-        # walls
-        half = self.w / 2
-        if self.x - half < 0:
-            self.x = half
-            self.vx = 0
-        if self.x + half > LOGICAL_W:
-            self.x = LOGICAL_W - half
-            self.vx = 0
-
-    def draw(self, surf: pg.Surface):
-        pg.draw.rect(surf, GREY, self.rect(), border_radius=10)
-        inner = self.rect().inflate(-int(self.w*0.3), -6)
-        pg.draw.rect(surf, CYAN, inner, border_radius=8)
+        # floats and bools only, so the kernel is compiled for a single signature
+        x, vx = _update_paddle(float(self.x), float(self.vx), bool(left), bool(right), float(dt))
+        self.x, self.vx = x, vx
+        self._rect.topleft = (int(x - self.w / 2), int(self.y - self.h / 2))
+
+    def draw(self, surf: pg.Surface, img: pg.Surface):
+        surf.blit(img, self._rect)
+
+    def render(self) -> pg.Surface:
+        """Pre-renderiza la paleta una sola vez; draw() solo hace blit"""
+        img = pg.Surface((self.w, self.h), pg.SRCALPHA)
+        rect = img.get_rect()
+        pg.draw.rect(img, GREY, rect, border_radius=10)
+        inner = rect.inflate(-int(self.w*0.3), -6)
+        pg.draw.rect(img, CYAN, inner, border_radius=8)
+        return img.convert_alpha()
 
 @dataclass
 class Ball:
@@ -184,58 +317,137 @@ class Ball:
     vy: float
     r: int = BALL_RADIUS
     stuck: bool = True
+    # bounding box of the drawn circle, refreshed by sync_rect() after moving
+    rect: pg.Rect = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rect = pg.Rect(0, 0, 2*self.r + 2, 2*self.r + 2)
+        self.sync_rect()
+
+    def sync_rect(self):
+        self.rect.topleft = (int(self.x) - self.r - 1, int(self.y) - self.r - 1)
 
     def update(self, dt: float):
         if self.stuck:
             return
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+        # work on locals and write the attributes back once
+        vx, vy, r = self.vx, self.vy, self.r
+        x = self.x + vx * dt
+        y = self.y + vy * dt
 
         # walls
-        if self.x - self.r < 0:
-            self.x = self.r
-            self.vx = abs(self.vx)
-        if self.x + self.r > LOGICAL_W:
-            self.x = LOGICAL_W - self.r
-            self.vx = -abs(self.vx)
-        if self.y - self.r < 0:
-            self.y = self.r
-            self.vy = abs(self.vy)
-
-    def draw(self, surf: pg.Surface):
-        pg.draw.circle(surf, WHITE, (int(self.x), int(self.y)), self.r)
-
-@dataclass
-class Brick:
-    rect: pg.Rect
-    color: tuple
-    alive: bool = True
-
-    def draw(self, surf: pg.Surface):
-        if not self.alive:
+        if x - r < 0:
+            x = r
+            vx = abs(vx)
+        if x + r > LOGICAL_W:
+            x = LOGICAL_W - r
+            vx = -abs(vx)
+        if y - r < 0:
+            y = r
+            vy = abs(vy)
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+
+    def draw(self, surf: pg.Surface, img: pg.Surface):
+        surf.blit(img, self.rect)
+
+    def render(self) -> pg.Surface:
+        """Pre-renderiza la pelota del mismo tamaño que su rect"""
+        img = pg.Surface(self.rect.size, pg.SRCALPHA)
+        pg.draw.circle(img, WHITE, (self.r + 1, self.r + 1), self.r)
+        return img.convert_alpha()
+
+def cells_in(x0: float, y0: float, x1: float, y1: float) -> list[tuple[int, int]]:
+    """Celdas (col, row) de la grilla de ladrillos que toca la caja [x0, x1] x [y0, y1]"""
+    cx0, cx1 = int((x0 - GRID_LEFT) // CELL_W), int((x1 - GRID_LEFT) // CELL_W)
+    cy0, cy1 = int((y0 - TOP_MARGIN) // CELL_H), int((y1 - TOP_MARGIN) // CELL_H)
+    return [(cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)]
+
+class Bricks:
+    """Ladrillos en formato SoA: un arreglo NumPy por campo en lugar de una lista de objetos"""
+    def __init__(self, xs: list[int] | np.ndarray, ys: list[int] | np.ndarray, colors: list[int] | np.ndarray):
+        n = len(xs)
+        self.bx = np.asarray(xs, dtype=np.int16)
+        self.by = np.asarray(ys, dtype=np.int16)
+        self.bw = np.full(n, BRICK_W, dtype=np.int16)
+        self.bh = np.full(n, BRICK_H, dtype=np.int16)
+        self.alive = np.ones(n, dtype=bool)
+        # live bricks, kept by remove() so the win check never scans `alive`
+        self.alive_count = n
+        # index into PALETTE (and into the brick image list), not an RGB tuple
+        self.colors = np.asarray(colors, dtype=np.uint8)
+        # float edges, computed once so the collision test is plain compares
+        self.left = self.bx.astype(np.float64)
+        self.right = self.left + self.bw
+        self.top = self.by.astype(np.float64)
+        self.bottom = self.top + self.bh
+        # spatial hash: cell -> indices of the live bricks overlapping it. Only the
+        # pure-Python path queries it; the Numba kernel scans every brick instead
+        self.cells: dict[tuple[int, int], list[int]] | None = None
+        if not HAS_NUMBA:
+            self.cells = {}
+            for i in range(n):
+                for key in self._cells_of(i):
+                    self.cells.setdefault(key, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.alive)
+
+    def _cells_of(self, i: int) -> list[tuple[int, int]]:
+        # a brick off the lattice (F10 cheat) may span several cells
+        x, y = int(self.bx[i]), int(self.by[i])
+        return cells_in(x, y, x + int(self.bw[i]) - 1, y + int(self.bh[i]) - 1)
+
+    def candidates(self, x: float, y: float, r: float) -> list[int]:
+        """Ladrillos vivos en las celdas (a lo sumo 2x2) bajo la caja de la pelota, en orden de índice"""
+        found: set[int] = set()
+        for key in cells_in(x - r, y - r, x + r, y + r):
+            found.update(self.cells.get(key, ()))
+        return sorted(found)
+
+    def remove(self, i: int):
+        self.alive_count -= 1
+        if self.cells is None:
             return
-        pg.draw.rect(surf, self.color, self.rect, border_radius=6)
-        pg.draw.rect(surf, (0,0,0), self.rect, width=1, border_radius=6)
+        for key in self._cells_of(i):
+            self.cells[key].remove(i)
+
+    def draw(self, surf: pg.Surface, imgs: list[pg.Surface]):
+        # one boolean mask drops the dead bricks; tolist() hands back plain ints
+        live = self.alive
+        seq = [(imgs[k], (x, y)) for k, x, y in zip(self.colors[live].tolist(),
+                                                    self.bx[live].tolist(), self.by[live].tolist())]
+        if HAS_FBLITS:
+            surf.fblits(seq)
+        else:
+            surf.blits(seq, doreturn=False)
+
+def render_brick(color: tuple) -> pg.Surface:
+    """Pre-renderiza un ladrillo de un color para luego solo hacer blit"""
+    img = pg.Surface((BRICK_W, BRICK_H), pg.SRCALPHA)
+    rect = img.get_rect()
+    pg.draw.rect(img, color, rect, border_radius=6)
+    pg.draw.rect(img, (0,0,0), rect, width=1, border_radius=6)
+    return img.convert_alpha()
 
 # ----------------------------
 # Level builder
 # ----------------------------
 
-def build_level(level: int) -> list[Brick]:
-    bricks: list[Brick] = []
-    palette = [MAGENTA, ORANGE, YELLOW, GREEN, CYAN, WHITE, RED]
+def build_level(level: int) -> Bricks:
+    xs: list[int] = []
+    ys: list[int] = []
+    colors: list[int] = []  # PALETTE indices
+    n_colors = len(PALETTE)
     
     total_w = BRICK_COLS * BRICK_W + (BRICK_COLS - 1) * BRICK_GAP
     left = (LOGICAL_W - total_w) // 2
     
-    # LEVEL 1: Standard Block
+    # LEVEL 1: Standard Block (full grid, built straight into the SoA arrays)
     if level == 1:
-        for row in range(BRICK_ROWS):
-            for col in range(BRICK_COLS):
-                x = left + col * (BRICK_W + BRICK_GAP)
-                y = TOP_MARGIN + row * (BRICK_H + BRICK_GAP)
-                rect = pg.Rect(x, y, BRICK_W, BRICK_H)
-                bricks.append(Brick(rect, palette[row % len(palette)], True))
+        cc, rr = np.meshgrid(np.arange(BRICK_COLS), np.arange(BRICK_ROWS))
+        bx = left + cc.ravel() * (BRICK_W + BRICK_GAP)
+        by = TOP_MARGIN + rr.ravel() * (BRICK_H + BRICK_GAP)
+        return Bricks(bx, by, rr.ravel() % n_colors)
                 
     # LEVEL 2: Checkerboard
     elif level == 2:
@@ -244,8 +456,8 @@ def build_level(level: int) -> list[Brick]:
                 if (row + col) % 2 == 0:
                     x = left + col * (BRICK_W + BRICK_GAP)
                     y = TOP_MARGIN + row * (BRICK_H + BRICK_GAP)
-                    rect = pg.Rect(x, y, BRICK_W, BRICK_H)
-                    bricks.append(Brick(rect, palette[(col) % len(palette)], True))
+                    xs.append(x); ys.append(y)
+                    colors.append(col % n_colors)
 
     # LEVEL 3: Pyramid
     elif level == 3:
@@ -258,17 +470,18 @@ def build_level(level: int) -> list[Brick]:
             for col in range(cols_in_row):
                 x = row_left + col * (BRICK_W + BRICK_GAP)
                 y = TOP_MARGIN + row * (BRICK_H + BRICK_GAP)
-                rect = pg.Rect(x, y, BRICK_W, BRICK_H)
-                bricks.append(Brick(rect, palette[row % len(palette)], True))
+                xs.append(x); ys.append(y)
+                colors.append(row % n_colors)
     
     # LEVEL 4: Columns / Towers (Sparse)
     elif level == 4:
+        red, white = PALETTE.index(RED), PALETTE.index(WHITE)
         for col in range(0, BRICK_COLS, 2):
             for row in range(BRICK_ROWS + 2):
                 x = left + col * (BRICK_W + BRICK_GAP)
                 y = TOP_MARGIN + row * (BRICK_H + BRICK_GAP)
-                rect = pg.Rect(x, y, BRICK_W, BRICK_H)
-                bricks.append(Brick(rect, RED if row % 2 == 0 else WHITE, True))
+                xs.append(x); ys.append(y)
+                colors.append(red if row % 2 == 0 else white)
 
     # LEVEL 5+: Random / Dense
     else:
@@ -277,10 +490,10 @@ def build_level(level: int) -> list[Brick]:
                 if random.random() > 0.2:
                     x = left + col * (BRICK_W + BRICK_GAP)
                     y = TOP_MARGIN + row * (BRICK_H + BRICK_GAP)
-                    rect = pg.Rect(x, y, BRICK_W, BRICK_H)
-                    bricks.append(Brick(rect, random.choice(palette), True))
+                    xs.append(x); ys.append(y)
+                    colors.append(random.randrange(n_colors))
 
-    return bricks
+    return Bricks(xs, ys, colors)
 
 def get_bg_color(level: int) -> tuple:
     if level <= 2: return BG_WORLD_1
@@ -292,12 +505,13 @@ def get_bg_color(level: int) -> tuple:
 # ----------------------------
 
 def reflect_ball_off_paddle(ball: Ball, paddle: Paddle, sfx: SFX | None):
-    prect = paddle.rect()
-    if ball.vy > 0 and prect.collidepoint(ball.x, ball.y + ball.r):
+    # plain float AABB test against the paddle's own coordinates, no Rect involved
+    half_w, top = paddle.w / 2, paddle.y - paddle.h / 2
+    if ball.vy > 0 and abs(ball.x - paddle.x) <= half_w and top <= ball.y + ball.r <= top + paddle.h:
         # place ball just above the paddle
-        ball.y = prect.top - ball.r
+        ball.y = top - ball.r
         # compute hit position (-1 left .. 1 right)
-        rel = (ball.x - prect.centerx) / (paddle.w / 2)
+        rel = (ball.x - paddle.x) / half_w
         rel = max(-1.0, min(1.0, rel))
         angle = math.radians(150 * rel + 90)  # 15°..165° upward
         speed = min(BALL_MAX_SPEED, math.hypot(ball.vx, ball.vy) + 6)
@@ -306,53 +520,101 @@ def reflect_ball_off_paddle(ball: Ball, paddle: Paddle, sfx: SFX | None):
         if sfx: sfx.hit.play()
 
 
-def ball_brick_collision(ball: Ball, bricks: list[Brick], sfx: SFX | None) -> int:
-    # sweep circle vs AABBs; simple resolution via last axis of min overlap
-    hit_count = 0
-    for b in bricks:
-        if not b.alive:
+@njit(cache=True, fastmath=True)
+def _collide(x, y, vx, vy, r, idx, lefts, rights, tops, bottoms, alive):
+    """Kernel de colisión pelota/ladrillos; marca `alive` y devuelve la pelota resuelta y el índice golpeado (-1 si ninguno)"""
+    for i in idx:
+        if not alive[i]:
             continue
+        left, right, top, bottom = lefts[i], rights[i], tops[i], bottoms[i]
         # expand brick by radius and treat ball center as point
-        expanded = b.rect.inflate(ball.r*2, ball.r*2)
-        if expanded.collidepoint(ball.x, ball.y):
-            # compute overlaps
-            dx_left = abs(ball.x - b.rect.left)
-            dx_right = abs(b.rect.right - ball.x)
-            dy_top = abs(ball.y - b.rect.top)
-            dy_bottom = abs(b.rect.bottom - ball.y)
-            minx = min(dx_left, dx_right)
-            miny = min(dy_top, dy_bottom)
-            if minx < miny:
-                # horizontal impact
-                if dx_left < dx_right:
-                    ball.x = b.rect.left - ball.r
-                    ball.vx = -abs(ball.vx)
-                else:
-                    ball.x = b.rect.right + ball.r
-                    ball.vx = abs(ball.vx)
+        if not (left - r <= x < right + r and top - r <= y < bottom + r):
+            continue
+        # compute overlaps
+        dx_left = abs(x - left)
+        dx_right = abs(right - x)
+        dy_top = abs(y - top)
+        dy_bottom = abs(bottom - y)
+        minx = min(dx_left, dx_right)
+        miny = min(dy_top, dy_bottom)
+        if minx < miny:
+            # horizontal impact
+            if dx_left < dx_right:
+                x = left - r
+                vx = -abs(vx)
             else:
-                # vertical impact
-                if dy_top < dy_bottom:
-                    ball.y = b.rect.top - ball.r
-                    ball.vy = -abs(ball.vy)
-                else:
-                    ball.y = b.rect.bottom + ball.r
-                    ball.vy = abs(ball.vy)
-            b.alive = False
-            # tiny speed up each brick
-            speed = min(BALL_MAX_SPEED, math.hypot(ball.vx, ball.vy) + BALL_SPEED_INC_ON_HIT)
-            ang = math.atan2(ball.vy, ball.vx)
-            ball.vx = math.cos(ang) * speed
-            ball.vy = math.sin(ang) * speed
-            hit_count += 1
-            if sfx: sfx.brick.play()
-    return hit_count
+                x = right + r
+                vx = abs(vx)
+        else:
+            # vertical impact
+            if dy_top < dy_bottom:
+                y = top - r
+                vy = -abs(vy)
+            else:
+                y = bottom + r
+                vy = abs(vy)
+        alive[i] = False
+        # tiny speed up each brick: rescale the vector, direction is unchanged
+        cur = math.sqrt(vx*vx + vy*vy)
+        if cur > 1e-6:
+            k = min(BALL_MAX_SPEED, cur + BALL_SPEED_INC_ON_HIT) / cur
+            vx *= k
+            vy *= k
+        # one brick per frame: the ball was just moved and reflected, testing
+        # the rest against it would only produce spurious double hits
+        return x, y, vx, vy, i
+    return x, y, vx, vy, -1
+
+
+def ball_brick_collision(ball: Ball, bricks: Bricks, sfx: SFX | None,
+                         broken: list[pg.Rect] | None = None) -> int:
+    # sweep circle vs AABBs; simple resolution via last axis of min overlap
+    r = ball.r
+    bx, by, bw, bh, alive = bricks.bx, bricks.by, bricks.bw, bricks.bh, bricks.alive
+    if HAS_NUMBA:
+        # the compiled kernel scans every brick faster than Python can hash the ball
+        idx = np.arange(len(alive))
+    else:
+        # broad phase: only bricks sharing a cell with the ball reach the kernel
+        idx = bricks.candidates(ball.x, ball.y, r)
+        if not idx:
+            return 0
+    # floats only, so the kernel is compiled for a single signature
+    ball.x, ball.y, ball.vx, ball.vy, i = _collide(float(ball.x), float(ball.y), float(ball.vx), float(ball.vy),
+                                                   float(r), idx, bricks.left, bricks.right,
+                                                   bricks.top, bricks.bottom, alive)
+    if i < 0:
+        return 0
+    bricks.remove(i)
+    if broken is not None:
+        broken.append(pg.Rect(int(bx[i]), int(by[i]), int(bw[i]), int(bh[i])))
+    if sfx: sfx.brick_channel.play(sfx.brick)
+    return 1
+
+def warmup_kernels():
+    """Compila los kernels de física antes del primer frame (no-op sin numba)"""
+    ball_brick_collision(Ball(0, 0, 0, 0), Bricks([], [], []), None)
+    Paddle().update(0.0, False, False)
 
 # ----------------------------
 # Network Helper
 # ----------------------------
-def send_score_to_server(username, score):
-    """Envía el puntaje al backend usando JavaScript fetch si estamos en web"""
+def _post_score(username, score):
+    """POST bloqueante al backend; se ejecuta en el hilo de red, nunca en el loop del juego"""
+    req = urllib.request.Request(
+        SCORES_API_URL,
+        data=json.dumps({"username": username, "score": score}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=2) as resp:
+            print(f"Score enviado: {score} para {username} (HTTP {resp.status})")
+    except OSError as e:
+        print(f"No se pudo enviar el score a {SCORES_API_URL}: {e}")
+
+def send_score_to_server(username, score, pool: ThreadPoolExecutor | None = None):
+    """Envía el puntaje al backend: fetch de JavaScript en web, hilo en segundo plano en nativo"""
     if sys.platform == "emscripten":
         from platform import window
         import json
@@ -382,13 +644,21 @@ def send_score_to_server(username, score):
             except:
                 pass
 
+    elif pool is not None:
+        pool.submit(_post_score, username, score)
     else:
-        print(f"Simulando envío de score: {score} para {username} (No estamos en web)")
+        _post_score(username, score)
 
 # ----------------------------
 # Game state
 # ----------------------------
 
+# Eventos que el juego procesa; el resto se bloquea en SDL.
+# TEXTINPUT sigue habilitado porque de él sale e.unicode en los KEYDOWN (input de nombre).
+HANDLED_EVENTS = [pg.QUIT, pg.KEYDOWN, pg.KEYUP, pg.TEXTINPUT, pg.MOUSEBUTTONDOWN, pg.VIDEORESIZE]
+LEFT_KEYS = (pg.K_LEFT, pg.K_a)
+RIGHT_KEYS = (pg.K_RIGHT, pg.K_d)
+
 # Estados del juego
 STATE_MENU = 0
 STATE_PLAYING = 1
@@ -402,13 +672,44 @@ class Game:
         self.font = pg.font.SysFont("consolas", 24)
         self.bigfont = pg.font.SysFont("consolas", 52, bold=True)
         self.input_font = pg.font.SysFont("consolas", 36)
+        # text surfaces for strings that repeat across frames
+        self.text = functools.lru_cache(maxsize=64)(self._render_text)
+        self._hud_key = None
+        self._hud_img: pg.Surface | None = None
+        self._fps_surface: pg.Surface | None = None
+        self._fps_last = 0
         
         self.sfx: SFX | None = None
         try:
             self.sfx = SFX()
         except Exception:
             self.sfx = None 
+
+        self.brick_imgs = [render_brick(color) for color in PALETTE]
+        self.paddle_img = Paddle().render()
+        self.ball_img = Ball(0, 0, 0, 0).render()
+        warmup_kernels()
+        # translucent layer shared by the name-entry and game-over screens
+        self._overlay = pg.Surface((LOGICAL_W, LOGICAL_H), pg.SRCALPHA)
+        self._overlay.fill((0, 0, 0, 180))
+        self._overlay = self._overlay.convert_alpha()
+
+        # Dirty-rect tracking: None means the whole frame must be presented.
+        # SCALED presents the whole frame through its renderer anyway, so only
+        # the manual-scaling fallback tracks rects (broken is None otherwise)
+        self.dirty: list[pg.Rect] | None = None
+        self.broken: list[pg.Rect] | None = None if self.screen.sdl_scaled else []
+        self._scene = None
+        self._prev_sprites: list[pg.Rect] = []
             
+        # paddle input, tracked from KEYDOWN/KEYUP instead of polling the keyboard
+        self._held_keys: set[int] = set()
+        self.left_down = False
+        self.right_down = False
+
+        # single worker: score POSTs never block the game loop
+        self._net_pool = ThreadPoolExecutor(max_workers=1)
+
         self.unlocked_level = 1
         self.init_menu()
         # Start at menu
@@ -431,6 +732,15 @@ class Game:
             rect = pg.Rect(x, y, btn_w, btn_h)
             self.level_buttons.append(rect)
 
+        # Textos fijos del menú, renderizados una sola vez
+        self._menu_title = self.bigfont.render("SELECT LEVEL", True, CYAN)
+        self._locked_txt = self.font.render("LOCKED", True, BLACK)
+        self._level_nums = [self.bigfont.render(str(i + 1), True, BLACK) for i in range(5)]
+        self._menu_instr = self.font.render("Click a level to start | ESC to quit", True, GREY)
+
+    def _render_text(self, font: pg.font.Font, text: str, color: tuple) -> pg.Surface:
+        return font.render(text, True, color)
+
     def start_level(self, level_num):
         self.level = level_num
         self.lives = LIVES_START
@@ -474,10 +784,7 @@ class Game:
         if self.paused:
             return
 
-        keys = pg.key.get_pressed()
-        left = keys[pg.K_LEFT] or keys[pg.K_a]
-        right = keys[pg.K_RIGHT] or keys[pg.K_d]
-        self.paddle.update(dt, left, right)
+        self.paddle.update(dt, self.left_down, self.right_down)
 
         if self.ball.stuck:
             self.ball.x = self.paddle.x
@@ -486,13 +793,14 @@ class Game:
             self.ball.update(dt)
 
         reflect_ball_off_paddle(self.ball, self.paddle, self.sfx)
-        got = ball_brick_collision(self.ball, self.bricks, self.sfx)
+        got = ball_brick_collision(self.ball, self.bricks, self.sfx, self.broken)
+        self.ball.sync_rect()
         self.score += got * 10
 
         if not self.ball.stuck and self.ball.y - self.ball.r > LOGICAL_H:
             self.lose_life()
 
-        if all(not b.alive for b in self.bricks):
+        if self.bricks.alive_count == 0:
             # Level Complete
             if self.sfx: self.sfx.win.play()
             
@@ -520,7 +828,7 @@ class Game:
 
     def draw_menu(self, surf: pg.Surface):
         # Draw Title
-        title = self.bigfont.render("SELECT LEVEL", True, CYAN)
+        title = self._menu_title
         surf.blit(title, (LOGICAL_W//2 - title.get_width()//2, 80))
         
         mouse_pos = self.screen.get_mouse_pos()
@@ -539,78 +847,73 @@ class Game:
             pg.draw.rect(surf, BLACK, rect, width=2, border_radius=8)
             
             if is_locked:
-                txt = self.font.render("LOCKED", True, BLACK)
+                txt = self._locked_txt
                 surf.blit(txt, (rect.centerx - txt.get_width()//2, rect.centery - txt.get_height()//2))
             else:
-                txt = self.bigfont.render(str(lvl_num), True, BLACK)
+                txt = self._level_nums[i]
                 surf.blit(txt, (rect.centerx - txt.get_width()//2, rect.centery - txt.get_height()//2))
         
         # Instructions
-        instr = self.font.render("Click a level to start | ESC to quit", True, GREY)
+        instr = self._menu_instr
         surf.blit(instr, (LOGICAL_W//2 - instr.get_width()//2, LOGICAL_H - 60))
 
     def draw_hud(self, surf: pg.Surface):
-        # FPS counter en la esquina superior izquierda
-        fps = self.clock.get_fps()
-        fps_txt = self.font.render(f"FPS: {fps:.1f} (Nativo)", True, GREEN)
-        surf.blit(fps_txt, (16, 16))
+        # FPS counter en la esquina superior izquierda, refrescado a 10 Hz
+        now = pg.time.get_ticks()
+        if self._fps_surface is None or now - self._fps_last > FPS_REFRESH_MS:
+            fps = self.clock.get_fps()
+            self._fps_surface = self.font.render(f"FPS: {fps:.1f} (Nativo)", True, GREEN)
+            self._fps_last = now
+        surf.blit(self._fps_surface, (16, 16))
         
-        # Score, Lives y Level debajo del FPS
-        txt = f"Score: {self.score:06d}   Lives: {max(0, self.lives)}   Level: {self.level}"
-        img = self.font.render(txt, True, WHITE)
-        surf.blit(img, (16, 46))
+        # Score, Lives y Level debajo del FPS (solo se re-renderiza si cambian)
+        key = (self.score, self.lives, self.level)
+        if key != self._hud_key:
+            txt = f"Score: {self.score:06d}   Lives: {max(0, self.lives)}   Level: {self.level}"
+            self._hud_img = self.font.render(txt, True, WHITE)
+            self._hud_key = key
+        surf.blit(self._hud_img, (16, 46))
 
     def draw_input_name(self, surf: pg.Surface):
-        overlay = pg.Surface((LOGICAL_W, LOGICAL_H), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        surf.blit(overlay, (0,0))
+        surf.blit(self._overlay, (0,0))
         
-        title = self.bigfont.render(self.final_message, True, YELLOW)
+        title = self.text(self.bigfont, self.final_message, YELLOW)
         surf.blit(title, (LOGICAL_W//2 - title.get_width()//2, LOGICAL_H//3))
         
-        instr = self.font.render("Enter your name:", True, WHITE)
+        instr = self.text(self.font, "Enter your name:", WHITE)
         surf.blit(instr, (LOGICAL_W//2 - instr.get_width()//2, LOGICAL_H//2 - 20))
         
         input_box = pg.Rect(LOGICAL_W//2 - 100, LOGICAL_H//2 + 10, 200, 40)
         pg.draw.rect(surf, WHITE, input_box, 2)
         
-        name_txt = self.input_font.render(self.player_name + "_", True, CYAN)
+        name_txt = self.text(self.input_font, self.player_name + "_", CYAN)
         surf.blit(name_txt, (input_box.x + 10, input_box.y + 8))
         
-        help_txt = self.font.render("Press ENTER to submit", True, GREY)
+        help_txt = self.text(self.font, "Press ENTER to submit", GREY)
         surf.blit(help_txt, (LOGICAL_W//2 - help_txt.get_width()//2, LOGICAL_H//2 + 60))
 
     def draw_game_over(self, surf: pg.Surface):
-        overlay = pg.Surface((LOGICAL_W, LOGICAL_H), pg.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        surf.blit(overlay, (0,0))
+        surf.blit(self._overlay, (0,0))
 
-        title = self.bigfont.render(self.final_message, True, YELLOW)
+        title = self.text(self.bigfont, self.final_message, YELLOW)
         surf.blit(title, (LOGICAL_W//2 - title.get_width()//2, LOGICAL_H//3))
         
-        score_txt = self.bigfont.render(f"Final Score: {self.score}", True, WHITE)
+        score_txt = self.text(self.bigfont, f"Final Score: {self.score}", WHITE)
         surf.blit(score_txt, (LOGICAL_W//2 - score_txt.get_width()//2, LOGICAL_H//2))
 
-        sub = self.font.render("Press M for Menu", True, CYAN)
+        sub = self.text(self.font, "Press M for Menu", CYAN)
         surf.blit(sub, (LOGICAL_W//2 - sub.get_width()//2, LOGICAL_H//2 + 60))
 
     def draw(self):
         s = self.screen.surface
         
+        self.screen.begin(self.bg_color)
         if self.state == STATE_MENU:
             self.draw_menu(s)
         else:
-            # Game rendering - background grid
-            line_col = (min(255, self.bg_color[0]+20), min(255, self.bg_color[1]+20), min(255, self.bg_color[2]+20))
-            for i in range(0, LOGICAL_W, 40):
-                pg.draw.line(s, line_col, (i, 0), (i, LOGICAL_H))
-            for i in range(0, LOGICAL_H, 40):
-                pg.draw.line(s, line_col, (0, i), (LOGICAL_W, i))
-
-            for b in self.bricks:
-                b.draw(s)
-            self.paddle.draw(s)
-            self.ball.draw(s)
+            self.bricks.draw(s, self.brick_imgs)
+            self.paddle.draw(s, self.paddle_img)
+            self.ball.draw(s, self.ball_img)
             self.draw_hud(s)
 
             if self.paused:
@@ -621,13 +924,44 @@ class Game:
             elif self.state == STATE_GAME_OVER:
                 self.draw_game_over(s)
 
+        if self.broken is not None:
+            self.dirty = self.track_dirty()
+
+    def track_dirty(self) -> list[pg.Rect] | None:
+        """Rects que cambiaron desde el frame anterior, o None si cambió toda la escena"""
+        if self.state != STATE_PLAYING or self.paused:
+            scene, sprites = None, []
+        else:
+            scene, sprites = self.bricks, [self.paddle.rect.copy(), self.ball.rect.copy()]
+        dirty = None
+        if scene is not None and scene is self._scene:
+            dirty = self._prev_sprites + sprites + self.broken + [HUD_RECT]
+        self._scene = scene
+        self._prev_sprites = sprites
+        self.broken.clear()
+        return dirty
+
     def _center_text(self, text, color):
-        img = self.bigfont.render(text, True, color)
+        img = self.text(self.bigfont, text, color)
         self.screen.surface.blit(img, (LOGICAL_W//2 - img.get_width()//2, LOGICAL_H//2 - img.get_height()//2))
 
+    def quit(self):
+        # let a pending score POST finish (bounded by its timeout) before exiting
+        self._net_pool.shutdown(wait=True)
+        pg.quit(); sys.exit(0)
+
     def handle_event(self, e: pg.event.Event):
         if e.type == pg.QUIT:
-            pg.quit(); sys.exit(0)
+            self.quit()
+        if e.type == pg.VIDEORESIZE:
+            self.screen.fit_window()
+        if e.type in (pg.KEYDOWN, pg.KEYUP) and e.key in LEFT_KEYS + RIGHT_KEYS:
+            if e.type == pg.KEYDOWN:
+                self._held_keys.add(e.key)
+            else:
+                self._held_keys.discard(e.key)
+            self.left_down = any(k in self._held_keys for k in LEFT_KEYS)
+            self.right_down = any(k in self._held_keys for k in RIGHT_KEYS)
             
         if self.state == STATE_MENU:
             if e.type == pg.MOUSEBUTTONDOWN:
@@ -640,7 +974,7 @@ class Game:
                                 self.start_level(lvl)
             if e.type == pg.KEYDOWN:
                 if e.key == pg.K_ESCAPE:
-                    pg.quit(); sys.exit(0)
+                    self.quit()
 
         elif self.state == STATE_PLAYING:
             if e.type == pg.KEYDOWN:
@@ -653,11 +987,14 @@ class Game:
                     self.paused = not self.paused
                 # --- CHEAT CODE: F10 to leave 1 brick ---
                 if e.key == pg.K_F10:
-                    if self.bricks:
-                        survivor = self.bricks[0]
-                        survivor.rect.centerx = int(self.paddle.x)
-                        survivor.rect.bottom = int(self.paddle.y - 100)
-                        self.bricks = [survivor]
+                    if len(self.bricks):
+                        survivor = Bricks([int(self.paddle.x) - BRICK_W // 2],
+                                          [int(self.paddle.y - 100) - BRICK_H],
+                                          self.bricks.colors[:1])
+                        if not self.bricks.alive[0]:
+                            survivor.alive[0] = False
+                            survivor.remove(0)
+                        self.bricks = survivor
                         print("CHEAT ACTIVATED: Only 1 brick remains!")
 
         elif self.state == STATE_INPUT_NAME:
@@ -665,7 +1002,7 @@ class Game:
                 if e.key == pg.K_RETURN:
                     if not self.player_name:
                         self.player_name = "Anonymous"
-                    send_score_to_server(self.player_name, self.score)
+                    send_score_to_server(self.player_name, self.score, self._net_pool)
                     self.state = STATE_GAME_OVER
                 elif e.key == pg.K_BACKSPACE:
                     self.player_name = self.player_name[:-1]
@@ -679,24 +1016,41 @@ class Game:
                     self.state = STATE_MENU
                     self.bg_color = BG_MENU
                 if e.key == pg.K_ESCAPE:
-                    pg.quit(); sys.exit(0)
+                    self.quit()
 
 # ----------------------------
 # Main loop
 # ----------------------------
 
 async def main():
+    # mono 16-bit like the synthesized tones, with a small buffer for low latency
+    pg.mixer.pre_init(44100, -16, 1, 512)
     pg.init()
+    pg.event.set_blocked(None)
+    pg.event.set_allowed(HANDLED_EVENTS)
     game = Game()
+    # frames are paced against a monotonic deadline by awaiting the event loop,
+    # so the wait happens in asyncio and not inside a blocking Clock.tick
+    target = 1.0 / FPS
+    # native builds sleep until 1 ms before the deadline and spin the rest;
+    # the browser build must never busy-wait
+    spin = 0.0 if sys.platform == "emscripten" else 0.001
+    prev = next_t = time.perf_counter()
     while True:
-        dt = game.clock.tick(FPS) / 1000.0
-        for e in pg.event.get():
+        now = time.perf_counter()
+        dt = now - prev
+        prev = now
+        game.clock.tick()  # no pacing here, it only feeds get_fps() for the HUD
+        for e in pg.event.get(HANDLED_EVENTS):
             game.handle_event(e)
-        game.screen.begin(game.bg_color)
         game.update(dt)
         game.draw()
-        game.screen.end()
-        await asyncio.sleep(0)
+        game.screen.end(game.dirty)
+        # a late frame moves the deadline instead of bursting to catch up
+        next_t = max(next_t + target, time.perf_counter())
+        await asyncio.sleep(max(0.0, next_t - time.perf_counter() - spin))
+        while spin and time.perf_counter() < next_t:
+            pass
 
 
 if __name__ == "__main__":
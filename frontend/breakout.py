@@ -26,6 +26,7 @@ from __future__ import annotations
 import math
 import random
 import sys
+import time
 import asyncio
 import json
 from dataclasses import dataclass
@@ -675,15 +676,24 @@ async def main():
         pg.init()
         game = Game()
         print("Game Initialized.")
+        # frames are paced against a monotonic deadline awaited in asyncio, so the
+        # browser gets the wait instead of a blocking Clock.tick
+        target = 1.0 / FPS
+        prev = next_t = time.perf_counter()
         while True:
-            dt = game.clock.tick(FPS) / 1000.0
+            now = time.perf_counter()
+            dt = now - prev
+            prev = now
+            game.clock.tick()  # no pacing here, it only feeds get_fps() for the HUD
             for e in pg.event.get():
                 game.handle_event(e)
             game.screen.begin(game.bg_color)
             game.update(dt)
             game.draw()
             game.screen.end()
-            await asyncio.sleep(0)
+            # a late frame moves the deadline instead of bursting to catch up
+            next_t = max(next_t + target, time.perf_counter())
+            await asyncio.sleep(max(0.0, next_t - time.perf_counter()))
     except Exception as e:
         print(f"CRITICAL ERROR: {e}")
         import traceback